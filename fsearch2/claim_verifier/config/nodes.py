@@ -15,7 +15,13 @@ EVIDENCE_RETRIEVAL_CONFIG = {
     # "hl": "cs",  # Google Serper hl parameter
     "gl": "en",  # Google Serper gl parameter
     "hl": "en",  # Google Serper hl parameter
-    "google_search_opts": "-site:demagog.cz -site:politifact.com -site:factcheck.org -site:snopes.com -factcheck.afp.com -filetype:pdf -filetype:docx"
+    "google_search_opts": "-site:demagog.cz -site:politifact.com -site:factcheck.org -site:snopes.com -factcheck.afp.com -filetype:pdf -filetype:docx",
+    "speculative_max_claim_length": 200,  # Longest claim searched speculatively as-is (fact_search pipeline)
+    "max_fetch_bytes": 2_000_000,  # Maximal number of bytes read from a fetched page
+    "url_cache_size": 256,  # Number of fetched pages kept in memory (all are also cached on disk)
+    "search_cache_ttl": 24 * 3600,  # Seconds to keep cached search results
+    "url_cache_ttl": 7 * 24 * 3600,  # Seconds to keep fetched pages in the on-disk cache
+    "user_agent": "Mozilla/5.0 (compatible; FactSearch2/1.0; +https://github.com/aic-factcheck/fsearch2)",  # User-Agent for full-text fetches
 }
 
 EVIDENCE_EVALUATION_CONFIG = {
@@ -5,16 +5,19 @@ Uses search queries to retrieve relevant evidence snippets from the web using ne
 
 import logging
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
 
 import httpx
+from async_lru import alru_cache
 from langchain_exa import ExaSearchRetriever
 from langchain_tavily import TavilySearch
 from langchain_community.utilities import GoogleSerperAPIWrapper
                 
 from claim_verifier.config import EVIDENCE_RETRIEVAL_CONFIG
 from claim_verifier.schemas import ClaimVerifierState, Evidence
-from fsearch2.utils.markdown import html_to_markdown
+from fsearch2.utils.cache import cache_key, get_cache
+from fsearch2.utils.markdown import CONVERTER_VERSION, html_to_markdown
 
 logger = logging.getLogger(__name__)
 
@@ -22,39 +25,142 @@ logger = logging.getLogger(__name__)
 RESULTS_PER_QUERY = EVIDENCE_RETRIEVAL_CONFIG["results_per_query"]
 SEARCH_PROVIDER = EVIDENCE_RETRIEVAL_CONFIG["search_provider"]
 GOOGLE_SEARCH_OPTS = EVIDENCE_RETRIEVAL_CONFIG["google_search_opts"]
+USER_AGENT = EVIDENCE_RETRIEVAL_CONFIG["user_agent"]
+MAX_FETCH_BYTES = EVIDENCE_RETRIEVAL_CONFIG["max_fetch_bytes"]
+URL_CACHE_SIZE = EVIDENCE_RETRIEVAL_CONFIG["url_cache_size"]
+SEARCH_CACHE_TTL = EVIDENCE_RETRIEVAL_CONFIG["search_cache_ttl"]
+URL_CACHE_TTL = EVIDENCE_RETRIEVAL_CONFIG["url_cache_ttl"]
 
+# Process-wide HTTP client for full-text fetches, created lazily on first use
+_CLIENT: Optional[httpx.AsyncClient] = None
 
-async def fetch_full_text(url: str) -> str:
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, reusing pooled keep-alive connections across fetches."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http1=True,
+            http2=True,
+            timeout=httpx.Timeout(connect=5, read=10, write=5, pool=5),
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=32),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+    return _CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+async def fetch_full_text(url: str, client: httpx.AsyncClient) -> str:
     """
     Fetch content from a URL and return it as Markdown or plain text.
     Handles HTML pages and PDFs.
     """
+    if not url:
+        return ""
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(url, follow_redirects=True)
+        # Stream the body so that non-HTML responses are never downloaded and huge pages are capped
+        async with client.stream("GET", url) as resp:
             if resp.status_code != 200:
                 return ""
 
             content_type = resp.headers.get("Content-Type", "").lower()
 
-            if "text/html" in content_type:
-                return html_to_markdown(resp.text)
-            elif "application/pdf" in content_type or url.lower().endswith(".pdf"):
-                # do not use for now
-                # return pdf_to_text(resp.content)
-                return ""
-            else:
-                logger.warning(f"Unsupported content type for {url}: {content_type}")
+            if "text/html" not in content_type:
+                if "application/pdf" in content_type or url.lower().endswith(".pdf"):
+                    # do not use for now
+                    # return pdf_to_text(await resp.aread())
+                    pass
+                else:
+                    logger.warning(f"Unsupported content type for {url}: {content_type}")
                 return ""
 
+            chunks = []
+            total = 0
+            async for chunk in resp.aiter_bytes(65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= MAX_FETCH_BYTES:
+                    logger.info(f"Truncated {url} at {total} bytes")
+                    break
+            html = b"".join(chunks).decode(resp.encoding or "utf-8", errors="replace")
+
+        # Parse in a worker thread so that concurrent fetches keep progressing
+        return await asyncio.to_thread(html_to_markdown, html)
+
     except Exception as e:
         logger.warning(f"Failed to fetch full text from {url}: {e}")
         return ""
 
 
+def _normalize_url(url: str) -> str:
+    """Lowercase the scheme and host only, paths and queries are case-sensitive."""
+    parts = urlsplit(url.strip())
+    return urlunsplit(parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower()))
+
+
+class _EmptyPage(Exception):
+    """Raised for pages without text; alru_cache does not memoize exceptions."""
+
+
+@alru_cache(maxsize=URL_CACHE_SIZE, ttl=URL_CACHE_TTL)
+async def _cached_full_text(url: str) -> str:
+    cache = get_cache("urls")
+    key = cache_key(CONVERTER_VERSION, _normalize_url(url))
+    # Pages can be megabytes, keep the disk I/O off the event loop
+    full_text = await asyncio.to_thread(cache.get, key)
+    if full_text is None:
+        full_text = await fetch_full_text(url, _get_client())
+        if not full_text:
+            # failed or empty fetches may be transient, do not pin them in either cache
+            raise _EmptyPage(url)
+        await asyncio.to_thread(cache.set, key, full_text, expire=URL_CACHE_TTL)
+    return full_text
+
+
+async def get_full_text(url: str) -> str:
+    """
+    Get the full text of a URL, fetching it only when neither the in-memory
+    nor the on-disk cache holds it. Pages are keyed by their normalized URL
+    and the converter version, so a converter change does not serve stale output.
+    Empty results are not cached, so a failed fetch is retried next time.
+    """
+    if not url:
+        return ""
+    try:
+        return await _cached_full_text(url)
+    except _EmptyPage:
+        return ""
+
+
+async def fill_full_text(evidence: List[Evidence]) -> List[Evidence]:
+    """Fetch the full text of evidence items that have a URL but no full text yet."""
+    missing = [i for i, ev in enumerate(evidence) if ev.url and not ev.full_text]
+    full_texts = await asyncio.gather(
+        *(get_full_text(evidence[i].url) for i in missing),
+        return_exceptions=True,
+    )
+    evidence = list(evidence)
+    for i, full_text in zip(missing, full_texts):
+        if isinstance(full_text, BaseException):
+            logger.warning(f"Failed to fetch full text from {evidence[i].url}: {full_text}")
+            continue
+        evidence[i] = evidence[i].model_copy(update={"full_text": full_text})
+    return evidence
+
+
 class SearchProviders:
     @staticmethod
-    async def exa(query: str) -> List[Evidence]:
+    async def exa(query: str, gl: str = "cz", hl: str = "cs", fetch_pages: bool = True) -> List[Evidence]:
+        # gl/hl are Google-specific and fetch_pages applies to Serper only,
+        # they are accepted for a uniform provider signature
         logger.info(f"Searching with Exa: '{query}'")
         try:
             retriever = ExaSearchRetriever(
@@ -79,7 +185,9 @@ class SearchProviders:
 
 
     @staticmethod
-    async def tavily(query: str) -> List[Evidence]:
+    async def tavily(query: str, gl: str = "cz", hl: str = "cs", fetch_pages: bool = True) -> List[Evidence]:
+        # gl/hl are Google-specific and fetch_pages applies to Serper only,
+        # they are accepted for a uniform provider signature
         logger.info(f"Searching with Tavily: '{query}'")
         try:
             search = TavilySearch(
@@ -97,35 +205,39 @@ class SearchProviders:
 
 
     @staticmethod
-    async def serper(query: str, gl: str = "cz", hl: str = "cs") -> List[Evidence]:
+    async def serper(query: str, gl: str = "cz", hl: str = "cs", fetch_pages: bool = True) -> List[Evidence]:
         hl, gl = EVIDENCE_RETRIEVAL_CONFIG.get("hl", hl), EVIDENCE_RETRIEVAL_CONFIG.get("gl", gl)
         logger.info(f"Searching with Serper: '{query}'")
         try:
-            wrapper = GoogleSerperAPIWrapper(gl=gl, hl=hl)
-            raw = await wrapper.aresults(query)
+            search_cache = get_cache("search")
+            key = cache_key(SEARCH_PROVIDER, gl, hl, query)
+            raw = await asyncio.to_thread(search_cache.get, key)
+            if raw is None:
+                wrapper = GoogleSerperAPIWrapper(gl=gl, hl=hl)
+                raw = await wrapper.aresults(query)
+                if isinstance(raw, dict):
+                    await asyncio.to_thread(search_cache.set, key, raw, expire=SEARCH_CACHE_TTL)
+            else:
+                logger.info(f"Serper results served from cache for '{query}'")
+
             if not isinstance(raw, dict):
                 # Fallback: treat as plain text
                 return [Evidence(url="", text=str(raw), title="Serper Search Result")]
 
             organic = raw.get("organic", []) or []
-            evidence: List[Evidence] = []
-            for item in organic[:RESULTS_PER_QUERY]:
-                if not isinstance(item, dict):
-                    continue
-                
-                url = item.get("link", "") or item.get("url", "")
-                text = (item.get("snippet") or item.get("content") or "")[:2000]
-                full_text = await fetch_full_text(url) if url else None
-    
-                evidence.append(
-                    Evidence(
-                        url=url,
-                        title=item.get("title", ""),
-                        text=text,
-                        full_text=full_text,
-                    )
+            evidence: List[Evidence] = [
+                Evidence(
+                    url=item.get("link", "") or item.get("url", ""),
+                    title=item.get("title", ""),
+                    text=(item.get("snippet") or item.get("content") or "")[:2000],
                 )
-                
+                for item in organic[:RESULTS_PER_QUERY]
+                if isinstance(item, dict)
+            ]
+            if fetch_pages:
+                # Fetch all result pages concurrently (cached pages are not re-downloaded)
+                evidence = await fill_full_text(evidence)
+
             # If nothing parsed, try summary field
             if not evidence and (summary := raw.get("answer_box") or raw.get("knowledgeGraph")):
                 evidence.append(
@@ -163,16 +275,19 @@ class SearchProviders:
                 return []
 
 
-async def _search_query(query: str, gl: str = "cz", hl: str = "cs") -> List[Evidence]:
-    query += " " + GOOGLE_SEARCH_OPTS
+# Search provider bound once at import time (Exa is the fallback)
+_SEARCH_FN = {
+    "tavily": SearchProviders.tavily,
+    "serper": SearchProviders.serper,
+}.get(SEARCH_PROVIDER.lower(), SearchProviders.exa)
+
+
+async def _search_query(
+    query: str, gl: str = "cz", hl: str = "cs", fetch_pages: bool = True
+) -> List[Evidence]:
+    query = f"{query} {GOOGLE_SEARCH_OPTS}"
     logger.debug(f"_search_query: {query}")
-    match SEARCH_PROVIDER.lower():
-        case "tavily":
-            return await SearchProviders.tavily(query)
-        case "serper":
-            return await SearchProviders.serper(query, gl=gl, hl=hl)
-        case _:
-            return await SearchProviders.exa(query)
+    return await _SEARCH_FN(query, gl=gl, hl=hl, fetch_pages=fetch_pages)
 
 
 async def retrieve_evidence_node(
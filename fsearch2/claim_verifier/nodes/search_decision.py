@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 from utils import call_llm_with_structured_output, get_llm
 
 from claim_verifier.config import ITERATIVE_SEARCH_CONFIG
+from claim_verifier.nodes.retrieve_evidence import fill_full_text
 from claim_verifier.prompts import (
     SEARCH_DECISION_HUMAN_PROMPT,
     SEARCH_DECISION_SYSTEM_PROMPT,
@@ -50,12 +51,22 @@ async def search_decision_node(
 
     max_iterations = ITERATIVE_SEARCH_CONFIG["max_iterations"]
 
+    # Fall back to the speculative search for the claim text when the generated queries found nothing
+    update = {}
+    if not evidence and state.speculative_evidence:
+        logger.info(
+            f"No evidence from generated queries, using {len(state.speculative_evidence)} speculative evidence snippets"
+        )
+        # the speculative search keeps snippets only, fetch the pages now that they are used
+        evidence = await fill_full_text(state.speculative_evidence)
+        update["evidence"] = [item.model_dump() for item in evidence]
+
     # Check stopping conditions
     if iteration_count >= max_iterations:
         logger.info(
             f"Reached maximum iterations ({max_iterations}), proceeding to final evaluation"
         )
-        return Command(goto="evaluate_evidence")
+        return Command(goto="evaluate_evidence", update=update or None)
 
     # Assess evidence sufficiency with LLM
     llm = get_llm()
@@ -92,7 +103,7 @@ async def search_decision_node(
         logger.warning(
             "Failed to assess evidence sufficiency, proceeding to final evaluation"
         )
-        return Command(goto="evaluate_evidence")
+        return Command(goto="evaluate_evidence", update=update or None)
 
     assessment = IntermediateAssessment(
         needs_more_evidence=response.needs_more_evidence,
@@ -111,6 +122,7 @@ async def search_decision_node(
         return Command(
             goto="generate_search_query",
             update={
+                **update,
                 "iteration_count": iteration_count + 1,
                 "intermediate_assessment": assessment,
             },
@@ -121,5 +133,5 @@ async def search_decision_node(
             f"total evidence: {len(evidence)} pieces"
         )
         return Command(
-            goto="evaluate_evidence", update={"intermediate_assessment": assessment}
+            goto="evaluate_evidence", update={**update, "intermediate_assessment": assessment}
         )
@@ -65,6 +65,9 @@ class ClaimVerifierState(BaseModel):
     query: Optional[str] = Field(default=None, description="Current search query")
     all_queries: List[str] = Field(default_factory=list, description="All queries used across iterations")
     evidence: Annotated[List[Evidence], add] = Field(default_factory=list)
+    speculative_evidence: List[Evidence] = Field(
+        default_factory=list, description="Evidence retrieved for the claim text itself, used when the queries find nothing"
+    )
     verdict: Optional[Verdict] = Field(default=None, description="Final verification result")
     iteration_count: int = Field(default=0, description="Current iteration number")
     intermediate_assessment: Optional[IntermediateAssessment] = Field(
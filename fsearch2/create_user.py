@@ -1,27 +1,84 @@
 #!/usr/bin/env python3
-import json
 import getpass
+import os
 from pathlib import Path
+
+import orjson
 from passlib.context import CryptContext
 
-USERS_FILE = Path("users.json")
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Append-only log of user records (one JSON object per line, the last record of a user wins)
+USERS_FILE = Path("users.jsonl")
+LEGACY_USERS_FILE = Path("users.json")
 
-def add_user(username: str):
-    password = getpass.getpass(f"Password for {username}: ")
-    pw_hash = pwd_context.hash(password)
+# Argon2 cost parameters (memory in KiB); tune for the deployment hardware.
+# Verification reads the parameters from the stored hash, so changing them
+# only affects newly added/updated users.
+ARGON2_TIME_COST = 3
+ARGON2_MEMORY_COST = 65536
+ARGON2_PARALLELISM = max(1, (os.cpu_count() or 2) // 2)
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
 
+
+def load_users() -> dict:
     users = {}
     if USERS_FILE.exists():
-        users = json.loads(USERS_FILE.read_text())
+        for line in USERS_FILE.read_bytes().splitlines():
+            if line.strip():
+                record = orjson.loads(line)
+                users[record["username"]] = {"password_hash": record["password_hash"]}
+    return users
+
+
+def _write_users(users: dict):
+    """Atomically rewrite the users file with a single record per user."""
+    tmp = USERS_FILE.with_name(USERS_FILE.name + ".tmp")
+    tmp.write_bytes(b"".join(
+        orjson.dumps({"username": username, **user}) + b"\n" for username, user in users.items()
+    ))
+    tmp.replace(USERS_FILE)
+
 
-    users[username] = {"password_hash": pw_hash}
-    USERS_FILE.write_text(json.dumps(users, indent=2))
+def migrate_legacy_users():
+    """Convert the former users.json (a single JSON object) to the append-only log."""
+    if LEGACY_USERS_FILE.exists() and not USERS_FILE.exists():
+        _write_users(orjson.loads(LEGACY_USERS_FILE.read_bytes()))
+        print(f"Migrated users from {LEGACY_USERS_FILE} to {USERS_FILE}")
+
+
+def add_user(username: str):
+    password = getpass.getpass(f"Password for {username}: ")
+    pw_hash = pwd_context.hash(password)
+
+    # O(1) update: append the new record instead of rewriting the whole file
+    with USERS_FILE.open("ab") as f:
+        f.write(orjson.dumps({"username": username, "password_hash": pw_hash}) + b"\n")
     print(f"✅ User '{username}' added/updated in {USERS_FILE}")
 
+
+def compact_users():
+    """Drop superseded records from the users file."""
+    users = load_users()
+    _write_users(users)
+    print(f"✅ Compacted {USERS_FILE} to {len(users)} users")
+
+
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser(description="Add or update a user for the FactSearch2 app")
-    p.add_argument("username")
+    p.add_argument("username", nargs="?")
+    p.add_argument("--compact", action="store_true", help="Rewrite the users file keeping only the latest record per user")
     args = p.parse_args()
-    add_user(args.username)
+    if not args.username and not args.compact:
+        p.error("a username or --compact is required")
+    migrate_legacy_users()
+    if args.username:
+        add_user(args.username)
+    if args.compact:
+        compact_users()
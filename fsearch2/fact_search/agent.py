@@ -1,5 +1,5 @@
 import logging
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from claim_verifier.nodes import (
@@ -7,7 +7,11 @@ from claim_verifier.nodes import (
     retrieve_evidence_node,
     search_decision_node,
 )
-from fact_search.nodes import evaluate_evidence_node, mock_retrieve_evidence_node
+from fact_search.nodes import (
+    evaluate_evidence_node,
+    mock_retrieve_evidence_node,
+    speculative_retrieve_evidence_node,
+)
 
 from claim_verifier.schemas import ClaimVerifierState
 
@@ -27,10 +31,15 @@ def create_graph() -> CompiledStateGraph:
     # workflow.add_edge("mock_retrieve_evidence", "evaluate_evidence")
     
     workflow.add_node("generate_search_query",  generate_search_query_node)
+    workflow.add_node("speculative_retrieve", speculative_retrieve_evidence_node)
     workflow.add_node("retrieve_evidence", retrieve_evidence_node)
     workflow.add_node("search_decision", search_decision_node)
     workflow.add_node("evaluate_evidence", evaluate_evidence_node, context={"text_reducer": "TBD"})
-    workflow.set_entry_point("generate_search_query")
+    # The claim text is searched speculatively while the first query is generated;
+    # search_decision falls back to these results when the generated queries find nothing
+    workflow.add_edge(START, "generate_search_query")
+    workflow.add_edge(START, "speculative_retrieve")
+    workflow.add_edge("speculative_retrieve", END)
     workflow.add_edge("generate_search_query", "retrieve_evidence")
     workflow.add_edge("retrieve_evidence", "search_decision")
     
@@ -12,10 +12,15 @@ EVIDENCE_EVALUATION_CONFIG = {
     "generate_verdict_instructions": "generate_verdict_instructions_v2.txt",
     # "model_name": "openai:gpt-5-nano",
     "model_name": "openai:gpt-5-mini",
-    "max_length": 50000
+    "max_length": 50000,  # Length an oversized evidence document is reduced to
+    "max_total_length": 250000,  # Total evidence length in the prompt above which the largest documents get reduced
+    "verdict_cache_similarity": None,  # Minimal claim embedding cosine similarity to reuse a cached verdict for the same evidence (e.g. 0.95), None = exact matches only
+    "verdict_cache_ttl": 24 * 3600,  # Seconds to keep cached verdicts (same as the search results they are based on)
+    "verdict_cache_max_approximate": 64,  # Number of most recent claims kept per evidence set for approximate matching
 }
 
 TEXT_REDUCER_CONFIG = {
+    # "vectors": "data/fasttext/vectors/cc.en.100.bin"  # dimension-reduced (see README)
     # "vectors": "data/fasttext/vectors/cc.cs.300.bin"
     "vectors": "data/fasttext/vectors/cc.en.300.bin"
 }
@@ -2,8 +2,10 @@
 
 from fact_search.nodes.mock_retrieve_evidence import mock_retrieve_evidence_node
 from fsearch2.fact_search.nodes.evaluate_evidence import evaluate_evidence_node
+from fsearch2.fact_search.nodes.speculative_retrieve_evidence import speculative_retrieve_evidence_node
 
 __all__ = [
     "mock_retrieve_evidence_node",
     "evaluate_evidence_node",
+    "speculative_retrieve_evidence_node",
 ]
@@ -3,11 +3,14 @@
 Analyzes evidence snippets to assess if a claim is supported, refuted, or inconclusive.
 """
 
+import asyncio
 from datetime import datetime, timezone, timedelta
+import itertools
 import logging
+import os
 from pathlib import Path
 import re
-from typing import List, Literal, Dict
+from typing import List, Literal, Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -29,22 +32,44 @@ from claim_verifier.schemas import (
 )
 
 from fact_search.schemas import ContextSchema, Verdict
+from fsearch2.fact_search.verdict_cache import VerdictCache, evidence_signature
 
 logger = logging.getLogger(__name__)
 
 # Retrieval settings
 MODEL_NAME = EVIDENCE_EVALUATION_CONFIG["model_name"]
 MAX_LENGTH = EVIDENCE_EVALUATION_CONFIG["max_length"]
+MAX_TOTAL_LENGTH = EVIDENCE_EVALUATION_CONFIG["max_total_length"]
 
 TEMPLATE_DIR = EVIDENCE_EVALUATION_CONFIG["template_dir"]
 TEMPLATE_PREDICT = EVIDENCE_EVALUATION_CONFIG["template_predict"]
 GENERATE_VERDICT_INSTRUCTIONS = EVIDENCE_EVALUATION_CONFIG["generate_verdict_instructions"]
 
+# Limits concurrent document reductions to the number of CPUs
+_REDUCE_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Evidence reference in an assessment, e.g. [3]
+_REF_RE = re.compile(r'\[(\d+)\]')
+
+verdict_cache = VerdictCache(
+    namespace=f"{MODEL_NAME}|{TEMPLATE_PREDICT}|{GENERATE_VERDICT_INSTRUCTIONS}",
+    similarity=EVIDENCE_EVALUATION_CONFIG["verdict_cache_similarity"],
+    max_approximate=EVIDENCE_EVALUATION_CONFIG["verdict_cache_max_approximate"],
+    ttl=EVIDENCE_EVALUATION_CONFIG["verdict_cache_ttl"],
+)
+
 class AssessmentResult(BaseModel):
     assessment: str = Field(description="Explanation of the verdict")
     veracity: Literal["untrue", "true", "unverifiable"] = Field(description="Claim classification")
 
 
+# Prompt template, instructions and output schema are loaded once per process
+_ENV = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False, cache_size=64)
+_TEMPLATE_PREDICT = _ENV.get_template(TEMPLATE_PREDICT)
+_INSTRUCTIONS = Path(TEMPLATE_DIR, GENERATE_VERDICT_INSTRUCTIONS).read_text()
+_SCHEMA = AssessmentResult.model_json_schema()
+
+
 def renumber_assessment_references(assessment: str, evidence: List[Evidence]) -> tuple[str, List[Evidence]]:
     """
     Renumber references in assessment to appear in increasing order.
@@ -57,30 +82,20 @@ def renumber_assessment_references(assessment: str, evidence: List[Evidence]) ->
     Returns:
         Tuple of (renumbered_assessment, reordered_sources)
     """
-    # Find all references in order of appearance
-    references = re.findall(r'\[(\d+)\]', assessment)
-    
-    if not references:
-        return assessment, evidence
-    
-    # Create mapping from old reference numbers to new ones
-    # Using dict to preserve order of first appearance
+    # Renumber references in a single pass, assigning new numbers in order of first appearance
     old_to_new: Dict[int, int] = {}
-    new_number = 1
-    
-    for ref in references:
-        old_ref = int(ref)
-        if old_ref not in old_to_new:
-            old_to_new[old_ref] = new_number
-            new_number += 1
-    
-    # Replace references in assessment
-    # We need to replace all occurrences, so we'll use a single pass with a function
+    counter = itertools.count(1)
+
     def replace_ref(match):
         old_ref = int(match.group(1))
-        return f'[{old_to_new.get(old_ref, old_ref)}]'
+        if old_ref not in old_to_new:
+            old_to_new[old_ref] = next(counter)
+        return f'[{old_to_new[old_ref]}]'
+    
+    new_assessment = _REF_RE.sub(replace_ref, assessment)
     
-    new_assessment = re.sub(r'\[(\d+)\]', replace_ref, assessment)
+    if not old_to_new:
+        return assessment, evidence
     
     # Reorder sources: referenced sources first (in new order), then unreferenced
     referenced_sources = []
@@ -94,81 +109,70 @@ def renumber_assessment_references(assessment: str, evidence: List[Evidence]) ->
         if old_idx < len(evidence):
             source = evidence[old_idx]
             # Mark as influential since it's referenced
-            referenced_sources.append(
-                Evidence(
-                    url=source.url,
-                    title=source.title,
-                    text=source.text,
-                    full_text=source.full_text,
-                    is_influential=True,
-                )
-            )
+            referenced_sources.append(source.model_copy(update={"is_influential": True}))
     
     # Then, add unreferenced sources
     for idx, source in enumerate(evidence):
         if idx not in old_indices_used:
-            unreferenced_sources.append(
-                Evidence(
-                    url=source.url,
-                    title=source.title,
-                    text=source.text,
-                    full_text=source.full_text,
-                    is_influential=False,
-                )
-            )
+            unreferenced_sources.append(source.model_copy(update={"is_influential": False}))
     
     reordered_sources = referenced_sources + unreferenced_sources
     
     return new_assessment, reordered_sources
 
 
-async def evaluate_evidence_node(state: ClaimVerifierState, runtime: Runtime[ContextSchema]) -> dict:
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-    template_predict = env.get_template(TEMPLATE_PREDICT)
-    instructions = Path(TEMPLATE_DIR, GENERATE_VERDICT_INSTRUCTIONS).read_text()
-    schema = AssessmentResult.model_json_schema()
-    
+async def _generate_assessment(claim_text: str, evidence: List[Evidence], context: dict, iteration_count: int) -> Optional[AssessmentResult]:
+    """Reduce oversized evidence documents and ask the LLM for an assessment of the claim."""
     tz = timezone(timedelta(hours=1))
     now = datetime.now(tz)
     formatted_now = now.strftime("%Y-%m-%d %H:%M:%S %z")
-  
-    claim = state.claim
-    evidence = state.evidence
-    iteration_count = state.iteration_count
 
-    runtime = get_runtime(ContextSchema)
-    
-    lengths = [len(ev.full_text) for ev in evidence]
+    # the prompt uses the full text and falls back to the snippet, measure the same
+    documents = [ev.full_text or ev.text for ev in evidence]
+    lengths = [len(doc) for doc in documents]
     logger.info(f"evidence lengths: {lengths}")
     
-    if any(l > MAX_LENGTH for l in lengths):
-        text_reducer = runtime.context["text_reducer"]
-        for didx, ev in enumerate(evidence):
-            if len(ev.full_text) > MAX_LENGTH:
+    # Reduce only when the evidence does not fit the prompt budget, largest documents first
+    total = sum(lengths)
+    to_reduce = []
+    if total > MAX_TOTAL_LENGTH:
+        for didx in sorted(range(len(evidence)), key=lambda i: lengths[i], reverse=True):
+            if total <= MAX_TOTAL_LENGTH or lengths[didx] <= MAX_LENGTH:
+                break
+            to_reduce.append(didx)
+            total -= lengths[didx] - MAX_LENGTH
+
+    if to_reduce:
+        text_reducer = context["text_reducer"]
+
+        async def reduce(didx: int) -> str:
+            async with _REDUCE_SEMAPHORE:
                 logger.info(f"Will reduce document idx: {didx}")
-                reduced_text = text_reducer.reduce(query=claim.claim_text, document=ev.full_text, maxLength=MAX_LENGTH)
-                logger.info(f"reduced to {len(reduced_text)}")
-                ev.full_text = reduced_text
+                return await asyncio.to_thread(
+                    text_reducer.reduce, query=claim_text, document=documents[didx], maxLength=MAX_LENGTH
+                )
+
+        # Reduce the oversized documents concurrently in worker threads
+        reduced_texts = await asyncio.gather(*(reduce(didx) for didx in to_reduce))
+        for didx, reduced_text in zip(to_reduce, reduced_texts):
+            logger.info(f"reduced document idx {didx} to {len(reduced_text)}")
+            evidence[didx].full_text = reduced_text
                 
     logger.info(
-        f"Final evaluation for claim '{claim.claim_text}' "
+        f"Final evaluation for claim '{claim_text}' "
         f"with {len(evidence)} evidence documents "
         f"after {iteration_count} iterations"
     )
     
-    query = f"""<date>{formatted_now}</date>
-<statement>{claim.claim_text}</statement>
-<evidences>
-"""
-    idx = 1
-    for ev in evidence:
-        query += f'<evidence id="{idx}">\n'
-        query += ev.text if len(ev.full_text) == 0 else ev.full_text
-        query += '</evidence>\n'
-        idx += 1 
-    query += '</evidences>'
+    parts = [f"<date>{formatted_now}</date>\n<statement>{claim_text}</statement>\n<evidences>\n"]
+    for idx, ev in enumerate(evidence, 1):
+        parts.append(f'<evidence id="{idx}">\n')
+        parts.append(ev.full_text or ev.text)
+        parts.append('</evidence>\n')
+    parts.append('</evidences>')
+    query = "".join(parts)
     
-    prompt_predict = template_predict.render(prompt=instructions, query=query, schema=schema)
+    prompt_predict = _TEMPLATE_PREDICT.render(prompt=_INSTRUCTIONS, query=query, schema=_SCHEMA)
 
     messages = [("user", prompt_predict)]
 
@@ -179,9 +183,44 @@ async def evaluate_evidence_node(state: ClaimVerifierState, runtime: Runtime[Con
         llm=llm,
         output_class=AssessmentResult,
         messages=messages,
-        context_desc=f"generating verdict for claim '{claim.claim_text}'",
+        context_desc=f"generating verdict for claim '{claim_text}'",
     )
-    
+
+    return response
+
+
+async def evaluate_evidence_node(state: ClaimVerifierState, runtime: Runtime[ContextSchema]) -> dict:
+    claim = state.claim
+    evidence = state.evidence
+    iteration_count = state.iteration_count
+
+    runtime = get_runtime(ContextSchema)
+    context = runtime.context or {}
+
+    # Skip the LLM entirely when the same (or a near-identical) claim was already assessed on the same evidence
+    signature = evidence_signature(evidence)
+    claim_vec = None
+    if verdict_cache.similarity is not None and "text_reducer" in context:
+        claim_vec = context["text_reducer"].embed(claim.claim_text)
+    cached = await asyncio.to_thread(verdict_cache.get, claim.claim_text, signature, claim_vec)
+    if cached is not None:
+        logger.info(f"Verdict for claim '{claim.claim_text}' served from cache")
+        response = AssessmentResult.model_validate(cached["result"])
+        # restore the reduced documents so that the sources match those of a fresh assessment
+        for didx, reduced_text in cached["reduced"].items():
+            evidence[int(didx)].full_text = reduced_text
+    else:
+        originals = [ev.full_text for ev in evidence]
+        response = await _generate_assessment(claim.claim_text, evidence, context, iteration_count)
+        if response:
+            reduced = {
+                str(didx): ev.full_text
+                for didx, ev in enumerate(evidence)
+                if ev.full_text != originals[didx]
+            }
+            entry = {"result": response.model_dump(), "reduced": reduced}
+            await asyncio.to_thread(verdict_cache.set, claim.claim_text, signature, entry, claim_vec)
+
     print(response)
 
     if not response:
@@ -0,0 +1,35 @@
+"""Speculative retrieve evidence node - searches for the claim text itself.
+
+Runs in parallel with the first search query generation. Only the search
+results (snippets) are retrieved so the node finishes well within the LLM call
+and does not hold back the next graph step; full texts are fetched by
+search_decision only when the generated query yields no evidence and these
+results are actually used.
+"""
+
+import logging
+from typing import Dict, List
+
+from claim_verifier.config import EVIDENCE_RETRIEVAL_CONFIG
+from claim_verifier.nodes.retrieve_evidence import _search_query
+from claim_verifier.schemas import ClaimVerifierState, Evidence
+
+logger = logging.getLogger(__name__)
+
+# Only short claims are usable as search queries on their own
+SPECULATIVE_MAX_CLAIM_LENGTH = EVIDENCE_RETRIEVAL_CONFIG["speculative_max_claim_length"]
+
+
+async def speculative_retrieve_evidence_node(
+    state: ClaimVerifierState,
+    gl: str = "cz",
+    hl: str = "cs",
+) -> Dict[str, List[Evidence]]:
+    claim_text = state.claim.claim_text
+    if state.iteration_count > 0 or len(claim_text) > SPECULATIVE_MAX_CLAIM_LENGTH:
+        return {"speculative_evidence": []}
+
+    evidence = await _search_query(claim_text, gl=gl, hl=hl, fetch_pages=False)
+    logger.info(f"Speculatively retrieved {len(evidence)} evidence snippets for the claim text")
+
+    return {"speculative_evidence": [item.model_dump() for item in evidence]}
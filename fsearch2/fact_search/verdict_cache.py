@@ -0,0 +1,94 @@
+"""Semantic cache for verdict generation.
+
+Two-tier cache of LLM assessments: an exact tier keyed by the claim text and
+the evidence signature, and an optional approximate tier matching near-identical
+claim embeddings against the same evidence signature. Mean word embeddings barely
+move when a number or a negation changes, so an approximate hit additionally
+requires the claims to have the same numbers and negation words.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from claim_verifier.schemas import Evidence
+from fsearch2.utils.cache import cache_key, get_cache
+
+# Bump when the layout of the cached entries changes
+_FORMAT = "2"
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_WORD_RE = re.compile(r"[\w']+")
+_NEGATIONS = {"no", "not", "never", "none", "nor", "neither", "nobody", "nothing", "nowhere", "without"}
+
+
+def evidence_signature(evidence: List[Evidence]) -> str:
+    """Hash the evidence documents in prompt order.
+
+    The order is kept because assessment references ([1], [2], ...) point to
+    evidence positions, so a cached assessment is only valid for the same order.
+    """
+    return cache_key(*(cache_key(ev.full_text or ev.text) for ev in evidence))
+
+
+def guard_tokens(claim_text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Numbers and negation words of a claim, in order.
+
+    Czech negates with the ne-/ni- prefix, so every word starting with it is
+    included; over-matching only costs cache hits, never correctness.
+    """
+    words = _WORD_RE.findall(claim_text.lower())
+    negations = tuple(
+        word for word in words
+        if word in _NEGATIONS or word.endswith("n't") or word.startswith(("ne", "ni"))
+    )
+    return tuple(_NUMBER_RE.findall(claim_text)), negations
+
+
+class VerdictCache:
+    def __init__(self, namespace: str, similarity: Optional[float], max_approximate: int, ttl: int):
+        """
+        Args:
+            namespace: Identifies the model and prompt the assessments were produced with
+            similarity: Minimal cosine similarity of claim embeddings for an approximate hit,
+                None disables the approximate tier
+            max_approximate: How many most recent claims to keep per evidence signature
+            ttl: Seconds to keep entries, verdicts depend on the date in the prompt
+        """
+        self.cache = get_cache("verdicts")
+        self.namespace = namespace
+        self.similarity = similarity
+        self.max_approximate = max_approximate
+        self.ttl = ttl
+
+    def get(self, claim_text: str, signature: str, claim_vec: Optional[np.ndarray] = None) -> Optional[dict]:
+        """Look up a cached assessment, trying the exact tier first."""
+        result = self.cache.get(cache_key("exact", _FORMAT, self.namespace, claim_text, signature))
+        if result is not None or claim_vec is None or self.similarity is None:
+            return result
+
+        guard = guard_tokens(claim_text)
+        entries = self.cache.get(cache_key("approx", _FORMAT, self.namespace, signature))
+        entries = [(vec, result) for vec, entry_guard, result in entries or [] if entry_guard == guard]
+        if not entries:
+            return None
+        vecs = np.stack([vec for vec, _ in entries])
+        scores = vecs @ _normalize(claim_vec)
+        best = int(scores.argmax())
+        return entries[best][1] if scores[best] >= self.similarity else None
+
+    def set(self, claim_text: str, signature: str, result: dict, claim_vec: Optional[np.ndarray] = None):
+        """Store an assessment in the exact and (given the claim embedding) approximate tier."""
+        self.cache.set(cache_key("exact", _FORMAT, self.namespace, claim_text, signature), result, expire=self.ttl)
+        if claim_vec is None or self.similarity is None:
+            return
+
+        key = cache_key("approx", _FORMAT, self.namespace, signature)
+        entries = self.cache.get(key) or []
+        entries.append((_normalize(claim_vec), guard_tokens(claim_text), result))
+        self.cache.set(key, entries[-self.max_approximate:], expire=self.ttl)
+
+
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    return (vec / (np.linalg.norm(vec) + 1e-9)).astype(np.float32)
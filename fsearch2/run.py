@@ -1,8 +1,9 @@
 import asyncio
 from fact_search.agent import create_graph
+from claim_verifier.nodes.retrieve_evidence import close_http_client
 from claim_verifier.schemas import ClaimVerifierState, ValidatedClaim
 
-from aic_nlp_utils.json import write_json
+from fsearch2.utils.serialization import write_json
 
 async def main():
     validated_claim = ValidatedClaim(
@@ -17,13 +18,16 @@ async def main():
     graph = create_graph()
 
     i = 1
-    async for chunk in graph.astream(
-        state,
-        stream_mode="updates"
-    ):
-        for node_name, result in chunk.items():
-            write_json(f"{i:02d}_{node_name}.json", result)
-        i += 1
+    try:
+        async for chunk in graph.astream(
+            state,
+            stream_mode="updates"
+        ):
+            for node_name, result in chunk.items():
+                write_json(f"{i:02d}_{node_name}.json", result)
+            i += 1
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -3,6 +3,7 @@
 Common tools shared across all components.
 """
 
+from .cache import cache_key, get_cache
 from .llm import (
     call_llm_with_structured_output,
     process_with_voting,
@@ -11,10 +12,14 @@ from .llm import (
 )
 from .models import get_llm, get_default_llm
 from .redis import redis_client, test_redis_connection
+from .serialization import dumps_json, dumps_msgpack, write_json
 from .settings import settings
 from .text import remove_following_sentences
 
 __all__ = [
+    # Cache utilities
+    "cache_key",
+    "get_cache",
     # Checkpointer utilities
     "create_checkpointer",
     "setup_checkpointer",
@@ -30,6 +35,10 @@ __all__ = [
     # Redis utilities
     "redis_client",
     "test_redis_connection",
+    # Serialization utilities
+    "dumps_json",
+    "dumps_msgpack",
+    "write_json",
     # Settings
     "settings",
     # Text utilities
@@ -0,0 +1,23 @@
+"""On-disk cache utilities.
+
+Content-addressed caches shared across workflow iterations, claims and runs.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from diskcache import Cache
+
+from .settings import settings
+
+
+def cache_key(*parts: str) -> str:
+    """Build a content-addressed key (SHA-1 hex digest) from the given parts."""
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_cache(name: str) -> Cache:
+    """Get the named on-disk cache stored under the configured cache directory."""
+    return Cache(str(Path(settings.cache_dir).expanduser() / name))
@@ -1,17 +1,164 @@
-from io import BytesIO
-import tempfile
-from markdownify import markdownify as md
+import re
+from typing import List, Optional
+
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+# from io import BytesIO
+# import tempfile
 # import pdfplumber
 # from pdf2markdown4llm import PDF2Markdown4LLM
-from readability import Document
+
+# Elements whose content is never part of the main text. Stripping removes the
+# whole subtree, so containers that may wrap the article (<form> on ASP.NET
+# pages, <header> holding the article title) are not listed.
+_SKIP_TAGS = [
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas",
+    "nav", "footer", "aside", "button", "select", "textarea",
+]
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "figure", "figcaption",
+    "dl", "dt", "dd", "address", "details", "summary",
+}
+# Bump whenever the output changes so that cached conversions are not reused
+CONVERTER_VERSION = "2"
+
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_CONTENT_SELECTOR = "article, main, [role=main]"
+_MIN_CONTENT_RATIO = 0.3
+
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Leading whitespace of a line, except for the indentation of nested list items
+_LEADING_WS_RE = re.compile(r"^[ \t]+(?![ \t]|(?:-|\d+\.) )", re.MULTILINE)
+
 
 def html_to_markdown(html: str) -> str:
     """
-    Convert HTML content to Markdown using readability + markdownify.
+    Convert HTML content to Markdown.
+
+    Parses the page once with the lexbor HTML5 parser, drops non-content
+    elements, picks the main content element and emits ATX-style Markdown
+    in a single traversal.
     """
-    doc = Document(html)
-    clean_html = doc.summary()
-    return md(clean_html, heading_style="ATX")
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(_SKIP_TAGS)
+    root = _main_content(tree)
+    if root is None:
+        return ""
+
+    out: List[str] = []
+    _render(root, out, depth=0)
+    lines: List[str] = []
+    in_fence = False
+    for line in "".join(out).splitlines():
+        line = line.rstrip()
+        if line == "```":
+            in_fence = not in_fence
+        elif not in_fence:
+            # code inside fenced blocks keeps its indentation
+            line = _LEADING_WS_RE.sub("", line)
+        lines.append(line)
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _main_content(tree: LexborHTMLParser) -> Optional[LexborNode]:
+    """Pick the content element holding most of the page text, falling back to <body>."""
+    body = tree.body
+    if body is None:
+        return None
+    candidates = tree.css(_CONTENT_SELECTOR)
+    if not candidates:
+        return body
+    best = max(candidates, key=lambda node: len(node.text(strip=True)))
+    if len(best.text(strip=True)) < _MIN_CONTENT_RATIO * len(body.text(strip=True)):
+        return body
+    return best
+
+
+def _table_rows(table: LexborNode):
+    """Yield the rows of a table in document order, skipping nested tables."""
+    for node in table.iter():
+        if node.tag == "tr":
+            yield node
+        elif node.tag in ("thead", "tbody", "tfoot"):
+            yield from (row for row in node.iter() if row.tag == "tr")
+
+
+def _inline(node: LexborNode, depth: int = 0) -> str:
+    out: List[str] = []
+    _render(node, out, depth)
+    return _WS_RE.sub(" ", "".join(out)).strip()
+
+
+def _render(node: LexborNode, out: List[str], depth: int) -> None:
+    for child in node.iter(include_text=True):
+        tag = child.tag
+        if tag == "-text":
+            out.append(_WS_RE.sub(" ", child.text(deep=False)))
+        elif tag in _HEADINGS:
+            text = _inline(child)
+            if text:
+                out.append(f"\n\n{'#' * _HEADINGS[tag]} {text}\n\n")
+        elif tag in ("ul", "ol"):
+            out.append("\n" if depth else "\n\n")
+            items = (item for item in child.iter() if item.tag == "li")
+            for i, item in enumerate(items, 1):
+                marker = f"{i}." if tag == "ol" else "-"
+                item_out: List[str] = []
+                _render(item, item_out, depth + 1)
+                text = _BLANK_LINES_RE.sub("\n", "".join(item_out)).strip()
+                if text:
+                    out.append(f"{'  ' * depth}{marker} {text}\n")
+            out.append("\n" if depth else "\n\n")
+        elif tag == "a":
+            text = _inline(child, depth)
+            href = child.attributes.get("href") or ""
+            if text and href and not href.startswith(("#", "javascript:")):
+                out.append(f"[{text}]({href})")
+            else:
+                out.append(text)
+        elif tag in ("strong", "b"):
+            text = _inline(child, depth)
+            if text:
+                out.append(f"**{text}**")
+        elif tag in ("em", "i"):
+            text = _inline(child, depth)
+            if text:
+                out.append(f"*{text}*")
+        elif tag == "code":
+            out.append(f"`{child.text()}`")
+        elif tag == "pre":
+            out.append(f"\n\n```\n{child.text().strip(chr(10))}\n```\n\n")
+        elif tag == "blockquote":
+            quote_out: List[str] = []
+            _render(child, quote_out, depth)
+            quote = _BLANK_LINES_RE.sub("\n\n", "".join(quote_out)).strip()
+            lines = [line.strip() for line in quote.splitlines()]
+            out.append("\n\n" + "\n".join(f"> {line}" for line in lines) + "\n\n")
+        elif tag == "table":
+            rows = [
+                [_inline(cell, depth).replace("|", "\\|") for cell in row.iter() if cell.tag in ("td", "th")]
+                for row in _table_rows(child)
+            ]
+            rows = [row for row in rows if row]
+            if rows:
+                width = max(len(row) for row in rows)
+                lines = ["| " + " | ".join(row + [""] * (width - len(row))) + " |" for row in rows]
+                # the first row doubles as the header row
+                lines.insert(1, "|" + " --- |" * width)
+                out.append("\n\n" + "\n".join(lines) + "\n\n")
+        elif tag == "br":
+            out.append("\n")
+        elif tag == "hr":
+            out.append("\n\n---\n\n")
+        elif tag == "img" or tag == "-comment":
+            continue
+        elif tag in _BLOCK_TAGS:
+            out.append("\n\n")
+            _render(child, out, depth)
+            out.append("\n\n")
+        else:
+            _render(child, out, depth)
+
 
 # The PDF conversion does not work well
 
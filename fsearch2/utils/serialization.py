@@ -0,0 +1,44 @@
+"""JSON serialization utilities.
+
+Fast orjson/msgspec-based helpers for persisting and sending workflow outputs.
+"""
+
+from pathlib import Path
+from typing import Any, Union
+
+import msgspec
+import orjson
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        obj: Object to serialize (pydantic models are dumped first)
+        indent: Whether to pretty-print with two-space indentation
+
+    Returns:
+        JSON bytes
+    """
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder(enc_hook=_default)
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    """Serialize an object to MessagePack (pydantic models are dumped first)."""
+    return _MSGPACK_ENCODER.encode(obj)
+
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = True) -> None:
+    """Write an object to a JSON file."""
+    Path(path).write_bytes(dumps_json(obj, indent=indent))
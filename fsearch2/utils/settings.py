@@ -41,6 +41,7 @@ class Settings(BaseSettings):
     exa_api_key: ExaAPIKey = Field(default=None, alias="EXA_API_KEY")
     tavily_api_key: TavilyAPIKey = Field(default=None, alias="TAVILY_API_KEY")
     redis_uri: RedisDsn = Field(default="redis://localhost:6379", alias="REDIS_URL")
+    cache_dir: str = Field(default="~/.cache/fsearch2", alias="FSEARCH2_CACHE_DIR")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -9,41 +9,61 @@ from aic_nlp_utils.split_merge import split_node_to_list
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
 class TextReducer:
     def __init__(self, vectors:str) -> str:
         logger.info(f"Loading FastText model: {vectors}")
         self.model = fasttext.load_model(vectors)
-        
-        
+
+
+    def tokenize(self, text: str):
+        return _WORD_RE.findall(text.lower())
+
+
+    def embed(self, text: str):
+        """Mean FastText word vector of the text."""
+        tokens = self.tokenize(text)
+        if not tokens:
+            return np.zeros(self.model.get_dimension())
+        vectors = [self.model.get_word_vector(tok) for tok in tokens]
+        return np.mean(vectors, axis=0)
+
+
     def reduce(self, query: str, document: str, maxLength: int):
-        def tokenize(text: str):
-            return re.findall(r"\w+", text.lower(), flags=re.UNICODE)
-
-        def get_embedding(text: str):
-            tokens = tokenize(text)
-            if not tokens:
-                return np.zeros(self.model.get_dimension())
-            vectors = [self.model.get_word_vector(tok) for tok in tokens]
-            return np.mean(vectors, axis=0)
-
-        def cosine(a, b):
-            return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-        
-        
         corpus = split_node_to_list(document, maxLength=maxLength)
         logger.info(f"running for maxLength={maxLength}")
 
         logger.info(f"query={query}")
-        query_vec = get_embedding(query)
-        scores = []
-        for doc in corpus:
-            doc_vec = get_embedding(doc)
-            sim = cosine(query_vec, doc_vec)
-            scores.append(sim)
-
-        ranking = np.argsort(scores)[::-1]
-        
-        idx = ranking[0]
+        query_vec = self.embed(query)
+
+        # Embed the tokens of all chunks in one pass, then average them per chunk
+        chunk_tokens = [self.tokenize(doc) for doc in corpus]
+        counts = np.array([len(tokens) for tokens in chunk_tokens])
+        tokens = [tok for toks in chunk_tokens for tok in toks]
+
+        # Look up each distinct token only once
+        dim = self.model.get_dimension()
+        uniq = list(set(tokens))
+        uniq_vectors = np.empty((len(uniq), dim), dtype=np.float32)
+        for i, tok in enumerate(uniq):
+            uniq_vectors[i] = self.model.get_word_vector(tok)
+        tok2row = {tok: i for i, tok in enumerate(uniq)}
+        rows = np.fromiter((tok2row[tok] for tok in tokens), dtype=np.intp, count=len(tokens))
+        vectors = uniq_vectors[rows]
+
+        doc_vecs = np.zeros((len(corpus), dim), dtype=np.float32)
+        nonempty = counts > 0
+        if nonempty.any():
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            doc_vecs[nonempty] = np.add.reduceat(vectors, starts[nonempty], axis=0) / counts[nonempty, None]
+
+        # L2-normalize once so that cosine similarity of all chunks to the query is a single matmul
+        doc_vecs /= np.linalg.norm(doc_vecs, axis=1, keepdims=True) + 1e-9
+        query_vec = query_vec / (np.linalg.norm(query_vec) + 1e-9)
+        scores = doc_vecs @ query_vec
+
+        idx = int(scores.argmax())
         best = corpus[idx]
         
         print(f"\nBest doc {idx} (score={scores[idx]:.3f}):")
@@ -1,32 +1,41 @@
-import json
+import base64
 import secrets
 import asyncio
+import hashlib
+import heapq
+import hmac
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from itertools import islice
+from datetime import datetime
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from time import time as _time
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
 from fastapi import (
     FastAPI,
     WebSocket,
-    WebSocketDisconnect,
     Query,
     Request,
     HTTPException,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import orjson
 from pydantic import BaseModel
 from passlib.context import CryptContext
 
+from claim_verifier.nodes.retrieve_evidence import close_http_client
 from claim_verifier.schemas import ClaimVerifierState, LoginRequest, ValidatedClaim
 from fact_search.agent import create_graph
-from aic_nlp_utils.json import write_json
 
 from fsearch2.fact_search.config.nodes import TEXT_REDUCER_CONFIG
+from fsearch2.utils.serialization import dumps_json, dumps_msgpack, write_json
 from fsearch2.utils.text_reducer import TextReducer
 
 # -------------------------------------------------
@@ -36,7 +45,7 @@ text_reducer = TextReducer(vectors=TEXT_REDUCER_CONFIG["vectors"])
 logger = logging.getLogger("fsearch2")
 logging.basicConfig(level=logging.INFO)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS (development: vite dev server on 5174). Update for production.
 ALLOWED_ORIGINS = ["http://localhost:5174", "http://localhost:4173"]
@@ -48,9 +57,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Users file (admin script writes this)
-USERS_FILE = Path("users.json")
+# Users file (admin script appends to this, one JSON record per line)
+USERS_FILE = Path("users.jsonl")
+# Read when users.jsonl does not exist yet (deployments not migrated by create_user.py)
+LEGACY_USERS_FILE = Path("users.json")
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+_users_cache: Dict[str, Any] = {"stamp": None, "data": {}}
+_users_lock = threading.Lock()
+
+# Recently verified logins (username -> (digest, expires)) so repeated logins
+# skip argon2. The digest covers password and stored hash under a per-process key.
+LOGIN_CACHE_TTL = 300
+LOGIN_CACHE_SIZE = 1024
+_login_cache: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+_LOGIN_CACHE_KEY = secrets.token_bytes(32)
 
 # Cookie/session configuration
 COOKIE_NAME = "fs2_session"
@@ -58,23 +78,96 @@ SESSION_TTL_HOURS = 8
 COOKIE_SAMESITE = "lax"  # 'none' for cross-site prod
 COOKIE_SECURE = False     # True for HTTPS prod
 
-# In-memory auth sessions (token -> {username, expires})
-AUTH_SESSIONS: Dict[str, Dict[str, Any]] = {}
-claim_sessions: Dict[str, Dict[str, Any]] = {}
+# Outgoing message batching: the writer waits WS_WRITE_DELAY after the first
+# queued message and coalesces up to WS_MAX_MESSAGES_IN_FRAME into one frame
+WS_MAX_MESSAGES_IN_FRAME = 16
+WS_WRITE_DELAY = 0.02
+# Updates kept per claim for replay on reconnect; clients may trim it further
+# by sending {"ack": seq}
+WS_REPLAY_BUFFER = 2048
+# Backpressure: the graph waits when this many messages are unsent and the
+# client is disconnected if the queue stays full for WS_SEND_TIMEOUT seconds
+WS_QUEUE_SIZE = 64
+WS_SEND_TIMEOUT = 30
+
+
+@dataclass(slots=True)
+class AuthSession:
+    username: str
+    expires: float  # unix timestamp
+
+
+@dataclass(slots=True)
+class ClaimSession:
+    claim_id: str
+    graph: Any
+    state: ClaimVerifierState
+    username: str
+    seq: int = 0
+    done: bool = False
+    updates: deque = field(default_factory=lambda: deque(maxlen=WS_REPLAY_BUFFER))
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=WS_QUEUE_SIZE))
+    task: Optional[asyncio.Task] = None
+    websocket: Optional[WebSocket] = None  # currently attached client
+    # constant fields of the streamed messages, copied per message
+    node_start_tpl: Dict[str, Any] = field(init=False)
+    node_update_tpl: Dict[str, Any] = field(init=False)
+
+    def __post_init__(self):
+        self.node_start_tpl = {"type": "node_start", "claim_id": self.claim_id, "status": "started"}
+        self.node_update_tpl = {"type": "node_update", "claim_id": self.claim_id, "status": "completed"}
+
+
+# In-memory auth sessions (token -> AuthSession)
+AUTH_SESSIONS: Dict[str, AuthSession] = {}
+# (expires, token) min-heap so the cleanup loop only touches expired sessions
+_expiry_heap: List[Tuple[float, str]] = []
+CLEANUP_BATCH = 256
+claim_sessions: Dict[str, ClaimSession] = {}
 
 
 # ---------- helpers ----------
+def _parse_users(path: Path) -> Dict[str, Any]:
+    if path == LEGACY_USERS_FILE:
+        # a single JSON object (username -> record)
+        logger.warning("Reading legacy %s, run create_user.py to migrate it to %s", path, USERS_FILE)
+        return orjson.loads(path.read_bytes())
+    users = {}
+    for line in path.read_bytes().splitlines():
+        if line.strip():
+            record = orjson.loads(line)
+            users[record["username"]] = record
+    return users
+
+
 def load_users() -> Dict[str, Any]:
-    if not USERS_FILE.exists():
-        return {}
-    try:
-        return json.loads(USERS_FILE.read_text())
-    except Exception:
-        logger.exception("Failed to load users.json")
+    # parsed users are reused until the file's mtime (or size, since appends
+    # can land within the same mtime tick) changes
+    with _users_lock:
+        for path in (USERS_FILE, LEGACY_USERS_FILE):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            stamp = (path, st.st_mtime_ns, st.st_size)
+            if stamp == _users_cache["stamp"]:
+                return _users_cache["data"]
+            try:
+                users = _parse_users(path)
+            except Exception:
+                logger.exception("Failed to load %s", path)
+                return {}
+            _users_cache["stamp"] = stamp
+            _users_cache["data"] = users
+            return users
         return {}
 
 
-def verify_user_password(username: str, password: str) -> bool:
+def _login_digest(password: str, pw_hash: str) -> bytes:
+    return hashlib.blake2b(f"{password}\0{pw_hash}".encode(), key=_LOGIN_CACHE_KEY).digest()
+
+
+async def verify_user_password(username: str, password: str) -> bool:
     users = load_users()
     user = users.get(username)
     if not user:
@@ -82,18 +175,34 @@ def verify_user_password(username: str, password: str) -> bool:
     pw_hash = user.get("password_hash")
     if not pw_hash:
         return False
+
+    digest = _login_digest(password, pw_hash)
+    cached = _login_cache.get(username)
+    if cached and cached[1] > _time() and hmac.compare_digest(cached[0], digest):
+        _login_cache.move_to_end(username)
+        return True
+
     try:
-        return pwd_context.verify(password, pw_hash)
+        # argon2 is deliberately slow, keep it off the event loop
+        ok = await asyncio.to_thread(pwd_context.verify, password, pw_hash)
     except Exception:
         logger.exception("Error verifying password for %s", username)
         return False
+    if ok:
+        _login_cache[username] = (digest, _time() + LOGIN_CACHE_TTL)
+        _login_cache.move_to_end(username)
+        if len(_login_cache) > LOGIN_CACHE_SIZE:
+            _login_cache.popitem(last=False)
+    return ok
 
 
 def create_auth_session(username: str, ttl_hours: int = SESSION_TTL_HOURS) -> str:
-    token = secrets.token_urlsafe(32)
-    expires = datetime.utcnow() + timedelta(hours=ttl_hours)
-    AUTH_SESSIONS[token] = {"username": username, "expires": expires.isoformat()}
-    logger.info("Created session for %s, token=%s (expires=%s)", username, token, expires)
+    token = base64.urlsafe_b64encode(secrets.token_bytes(24)).decode()
+    expires = _time() + ttl_hours * 3600
+    AUTH_SESSIONS[token] = AuthSession(username=username, expires=expires)
+    heapq.heappush(_expiry_heap, (expires, token))
+    logger.info("Created session for %s, token=%s (expires=%s)",
+                username, token, datetime.utcfromtimestamp(expires))
     return token
 
 
@@ -101,17 +210,10 @@ def get_username_from_session(token: Optional[str]) -> Optional[str]:
     if not token:
         return None
     session = AUTH_SESSIONS.get(token)
-    if not session:
-        return None
-    try:
-        expires = datetime.fromisoformat(session["expires"])
-    except Exception:
+    if session is None or session.expires < _time():
         AUTH_SESSIONS.pop(token, None)
         return None
-    if expires < datetime.utcnow():
-        AUTH_SESSIONS.pop(token, None)
-        return None
-    return session["username"]
+    return session.username
 
 
 def destroy_session(token: Optional[str]):
@@ -122,11 +224,18 @@ def destroy_session(token: Optional[str]):
 async def _cleanup_sessions_loop():
     while True:
         try:
-            now = datetime.utcnow()
-            expired = [t for t, s in AUTH_SESSIONS.items()
-                       if datetime.fromisoformat(s["expires"]) < now]
-            for t in expired:
-                AUTH_SESSIONS.pop(t, None)
+            now = _time()
+            popped = 0
+            while _expiry_heap and _expiry_heap[0][0] < now:
+                expires, token = heapq.heappop(_expiry_heap)
+                session = AUTH_SESSIONS.get(token)
+                # the token may be gone already or carry a newer expiry
+                if session and session.expires == expires:
+                    del AUTH_SESSIONS[token]
+                popped += 1
+                if popped % CLEANUP_BATCH == 0:
+                    # let logins and streams run between slices of a large sweep
+                    await asyncio.sleep(0)
             await asyncio.sleep(60 * 5)
         except asyncio.CancelledError:
             break
@@ -139,13 +248,18 @@ async def startup_tasks():
     asyncio.create_task(_cleanup_sessions_loop())
 
 
+@app.on_event("shutdown")
+async def shutdown_tasks():
+    await close_http_client()
+
+
 # ---------- auth endpoints ----------
 @app.post("/api/login")
 async def login(req: LoginRequest):
-    if not verify_user_password(req.username, req.password):
-        return JSONResponse(status_code=401, content={"detail": "Invalid username or password"})
+    if not await verify_user_password(req.username, req.password):
+        return ORJSONResponse(status_code=401, content={"detail": "Invalid username or password"})
     token = create_auth_session(req.username)
-    resp = JSONResponse({"ok": True, "username": req.username})
+    resp = ORJSONResponse({"ok": True, "username": req.username})
     resp.set_cookie(
         key=COOKIE_NAME,
         value=token,
@@ -162,7 +276,7 @@ async def login(req: LoginRequest):
 async def logout(request: Request):
     token = request.cookies.get(COOKIE_NAME)
     destroy_session(token)
-    resp = JSONResponse({"ok": True})
+    resp = ORJSONResponse({"ok": True})
     resp.delete_cookie(COOKIE_NAME, path="/")
     return resp
 
@@ -177,69 +291,112 @@ async def me(request: Request):
 
 
 # ---------- WebSocket ----------
+def _handle_ack(claim_id: str, data: Union[str, bytes]):
+    # {"ack": seq} drops updates the client no longer needs replayed
+    try:
+        ack = orjson.loads(data).get("ack")
+    except Exception:
+        return
+    session = claim_sessions.get(claim_id)
+    if not session or not isinstance(ack, int):
+        return
+    updates = session.updates
+    while updates and updates[0]["seq"] <= ack:
+        updates.popleft()
+
+
+async def _send_message(websocket: WebSocket, data: Any):
+    # MessagePack binary frames for clients that asked for ?encoding=msgpack,
+    # otherwise orjson-encoded text frames
+    if websocket.state.msgpack:
+        await websocket.send_bytes(dumps_msgpack(data))
+    else:
+        await websocket.send_text(dumps_json(data).decode())
+
+
+async def _send_batch(websocket: WebSocket, batch: list):
+    # a lone message goes out as-is, several are wrapped in a batch frame
+    await _send_message(websocket, batch[0] if len(batch) == 1 else {"type": "batch", "items": batch})
+
+
+async def _socket_writer(websocket: WebSocket, queue: asyncio.Queue, claim_id: str):
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(WS_WRITE_DELAY)
+        while len(batch) < WS_MAX_MESSAGES_IN_FRAME and not queue.empty():
+            batch.append(queue.get_nowait())
+        try:
+            await _send_batch(websocket, batch)
+        except Exception:
+            logger.exception("Send failed for claim %s", claim_id)
+
+
 @app.websocket("/ws/claims/{claim_id}")
-async def ws_claim(websocket: WebSocket, claim_id: str, last_seq: int = Query(default=0)):
-    await websocket.accept()
+async def ws_claim(
+    websocket: WebSocket,
+    claim_id: str,
+    last_seq: int = Query(default=0),
+    encoding: str = Query(default="json"),
+):
+    # reject during the upgrade: closing before accept() answers the handshake with 403
     token = websocket.cookies.get(COOKIE_NAME)
     username = get_username_from_session(token)
 
     if not username:
-        try:
-            await websocket.send_json({
-                "type": "error",
-                "error": "Unauthorized: please login first",
-                "message": "Unauthorized: please login first",
-                "seq": 0,
-                "claim_id": claim_id,
-                "timestamp": datetime.utcnow().isoformat(),
-            })
-        except Exception:
-            pass
         await websocket.close(code=4001)
         logger.info("Unauthorized websocket connection attempt to claim %s", claim_id)
         return
 
+    websocket.state.msgpack = encoding == "msgpack"
+    await websocket.accept()
     logger.info("New WS connection user=%s claim_id=%s", username, claim_id)
 
     session = claim_sessions.get(claim_id)
     if session:
-        missed = [u for u in session["updates"] if u.get("seq", -1) > last_seq]
-        for msg in missed:
+        # anything still queued from the previous connection is part of the replay
+        queue = session.queue
+        while not queue.empty():
+            queue.get_nowait()
+        # seq is dense, so the update after last_seq sits at a fixed offset from the head
+        updates = session.updates
+        start = max(last_seq - updates[0]["seq"] + 1, 0) if updates else 0
+        missed = list(islice(updates, start, None))
+        for i in range(0, len(missed), WS_MAX_MESSAGES_IN_FRAME):
             try:
-                await websocket.send_json(msg)
+                await _send_batch(websocket, missed[i:i + WS_MAX_MESSAGES_IN_FRAME])
             except Exception:
-                logger.exception("Failed to send missed msg to %s", claim_id)
-        if session.get("done"):
-            await websocket.send_json({
+                logger.exception("Failed to send missed msgs to %s", claim_id)
+        if session.done:
+            await _send_message(websocket, {
                 "type": "graph_complete",
                 "claim_id": claim_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
             })
     else:
         # Expect initial claim_text
         try:
             init_msg = await asyncio.wait_for(websocket.receive_json(), timeout=10)
         except asyncio.TimeoutError:
-            await websocket.send_json({
+            await _send_message(websocket, {
                 "type": "error",
                 "error": "No claim_text provided within 10s",
                 "message": "No claim_text provided within 10s",
                 "seq": 0,
                 "claim_id": claim_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
             })
             await websocket.close(code=4002)
             return
 
         claim_text = init_msg.get("claim_text", "").strip()
         if not claim_text:
-            await websocket.send_json({
+            await _send_message(websocket, {
                 "type": "error",
                 "error": "Empty claim_text",
                 "message": "Empty claim_text",
                 "seq": 0,
                 "claim_id": claim_id,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
             })
             await websocket.close(code=4003)
             return
@@ -247,16 +404,11 @@ async def ws_claim(websocket: WebSocket, claim_id: str, last_seq: int = Query(de
         state = ClaimVerifierState(claim=ValidatedClaim(claim_text=claim_text))
         graph = create_graph()
 
-        claim_sessions[claim_id] = {
-            "graph": graph,
-            "state": state,
-            "seq": 0,
-            "updates": [],
-            "username": username,
-        }
+        session = ClaimSession(claim_id=claim_id, graph=graph, state=state, username=username)
+        claim_sessions[claim_id] = session
 
-        task = asyncio.create_task(run_graph_and_stream(claim_id, websocket))
-        claim_sessions[claim_id]["task"] = task
+        task = asyncio.create_task(run_graph_and_stream(claim_id))
+        session.task = task
 
         def _task_done(t: asyncio.Task):
             try:
@@ -268,91 +420,127 @@ async def ws_claim(websocket: WebSocket, claim_id: str, last_seq: int = Query(de
 
         task.add_done_callback(_task_done)
 
+    session.websocket = websocket
+    writer = asyncio.create_task(
+        _socket_writer(websocket, session.queue, claim_id)
+    )
+
     try:
+        # low-level receive: a disconnect ends the loop, frames go to the ack handler as-is
         while True:
-            _ = await websocket.receive_text()
-    except WebSocketDisconnect:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("text") or message.get("bytes")
+            if data:
+                _handle_ack(claim_id, data)
+    finally:
         logger.info("WS disconnected for claim_id=%s (user=%s)", claim_id, username)
+        writer.cancel()
+        if session.websocket is websocket:
+            session.websocket = None
         sess = claim_sessions.get(claim_id)
         if sess:
-            task = sess.get("task")
+            task = sess.task
             if task and not task.done():
                 task.cancel()
 
 
 # ---------- graph runner ----------
-async def run_graph_and_stream(claim_id: str, websocket: WebSocket):
+async def _enqueue(session: ClaimSession, msg: Dict[str, Any]):
+    # blocks the graph while the client is behind; a client stuck for too long is
+    # dropped (the message stays in session.updates for replay on reconnect)
+    try:
+        await asyncio.wait_for(session.queue.put(msg), timeout=WS_SEND_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Client for claim %s is not keeping up, closing the socket", session.claim_id)
+        if session.websocket is not None:
+            try:
+                await session.websocket.close(code=1011)
+            except Exception:
+                logger.debug("Failed to close socket for claim %s", session.claim_id)
+
+
+def _maybe_dump(x: Any) -> Any:
+    model_dump = getattr(x, "model_dump", None)
+    return model_dump() if model_dump is not None else x
+
+
+async def _disk_writer(queue: asyncio.Queue):
+    # writes (path, obj) items off the event loop until a None sentinel arrives
+    while (item := await queue.get()) is not None:
+        path, obj = item
+        try:
+            await asyncio.to_thread(write_json, path, obj)
+        except Exception:
+            logger.exception("Failed to write %s", path)
+
+
+async def run_graph_and_stream(claim_id: str):
     session = claim_sessions[claim_id]
-    graph = session["graph"]
-    state = session["state"]
+    graph = session.graph
+    state = session.state
+    node_start_tpl = session.node_start_tpl
+    node_update_tpl = session.node_update_tpl
 
     base_dir = Path("run")
     base_dir.mkdir(exist_ok=True)
     run_dir = base_dir / datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     run_dir.mkdir()
+    disk_queue: asyncio.Queue = asyncio.Queue()
+    disk_writer = asyncio.create_task(_disk_writer(disk_queue))
 
     try:
         async for chunk in graph.astream(
             state, stream_mode=["debug", "updates"], context={"text_reducer": text_reducer}
         ):
             stream_mode, data = chunk
+            # one timestamp for all messages produced by this chunk
+            now = datetime.utcnow()
 
             if stream_mode == "debug":
                 if data.get("type") == "task" and data.get("step") is not None:
                     payload = data["payload"]
                     node_name = payload.get("name", "unknown")
-                    session["seq"] += 1
+                    session.seq += 1
                     input_ = payload.get("input", {})
-                    msg = {
-                        "type": "node_start",
-                        "claim_id": claim_id,
-                        "node": node_name,
-                        "seq": session["seq"],
-                        "status": "started",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "payload": getattr(input_, "model_dump", lambda: input_)(),
-                    }
-                    session["updates"].append(msg)
-                    try:
-                        await websocket.send_json(msg)
-                    except Exception:
-                        logger.exception("Send failed for claim %s (debug)", claim_id)
+                    msg = node_start_tpl.copy()
+                    msg["node"] = node_name
+                    msg["seq"] = session.seq
+                    msg["timestamp"] = now
+                    msg["payload"] = _maybe_dump(input_)
+                    session.updates.append(msg)
+                    await _enqueue(session, msg)
 
             elif stream_mode == "updates":
                 for node_name, result in data.items():
-                    session["seq"] += 1
-                    msg = {
-                        "type": "node_update",
-                        "claim_id": claim_id,
-                        "node": node_name,
-                        "seq": session["seq"],
-                        "status": "completed",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "payload": result,
-                    }
-                    write_json(run_dir / f"server_{session['seq']:02d}_{node_name}.json", result)
+                    session.seq += 1
+                    msg = node_update_tpl.copy()
+                    msg["node"] = node_name
+                    msg["seq"] = session.seq
+                    msg["timestamp"] = now
+                    msg["payload"] = result
+                    path = run_dir / f"server_{session.seq:02d}_{node_name}.json"
+                    disk_queue.put_nowait((path, result))
                     if node_name == "evaluate_evidence":
-                        session["done"] = True
-                    session["updates"].append(msg)
-                    try:
-                        await websocket.send_json(msg)
-                    except Exception:
-                        logger.exception("Send failed for claim %s (updates)", claim_id)
+                        session.done = True
+                    session.updates.append(msg)
+                    await _enqueue(session, msg)
 
     except Exception as e:
         logger.exception("Error while running graph for claim %s", claim_id)
-        session["seq"] += 1
+        session.seq += 1
         err_msg = {
             "type": "error",
             "claim_id": claim_id,
-            "seq": session["seq"],
+            "seq": session.seq,
             "error": str(e),
             "message": str(e),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
         }
-        session["updates"].append(err_msg)
-        try:
-            await websocket.send_json(err_msg)
-        except Exception:
-            logger.debug("Failed to send error msg to client %s (socket may be closed)", claim_id)
-        session["done"] = True
+        session.updates.append(err_msg)
+        await _enqueue(session, err_msg)
+        session.done = True
+    finally:
+        disk_queue.put_nowait(None)
+        await disk_writer